@@ -5,13 +5,32 @@ SARS-CoV-2 Multi-Intent Knowledge Graph - Python Integration
 Connects Rust limit-sarscov2 module with AI Research Agent
 """
 
+import binascii
 import json
-import subprocess
-import uuid
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+import os
+import re
+import sys
+from array import array
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Deque, Optional, Sequence, Union
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import datetime
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Number of identifiers drawn from a single os.urandom() call
+ID_BATCH_SIZE = 1024
+
+# Node type names, indexed by the codes stored in node_types
+NODE_TYPES = ("virology", "immunology", "genomics", "treatment", "public_health")
+_NODE_TYPE_CODES = {t: i for i, t in enumerate(NODE_TYPES)}
+
 
 class ResearchDomain(Enum):
     """Research domains for SARS-CoV-2 knowledge graph"""
@@ -31,7 +50,26 @@ class HypothesisType(Enum):
     PUBLIC_HEALTH_IMPACT = "PublicHealthImpact"
 
 
-@dataclass
+# HypothesisType -> value, avoiding the Enum .value descriptor on hot paths
+_HYP_VAL = {h: h.value for h in HypothesisType}
+
+# Hypothesis type strings, accepted anywhere a HypothesisType is
+HT_TRANSMISSIBILITY = HypothesisType.TRANSMISSIBILITY.value
+HT_VACCINE_EFFICACY = HypothesisType.VACCINE_EFFICACY.value
+HT_IMMUNE_ESCAPE = HypothesisType.IMMUNE_ESCAPE.value
+HT_TREATMENT_RESPONSE = HypothesisType.TREATMENT_RESPONSE.value
+HT_PUBLIC_HEALTH_IMPACT = HypothesisType.PUBLIC_HEALTH_IMPACT.value
+
+# Interned domain names, so all edges share one str object per domain
+DOMAINS = {d.value: sys.intern(d.value) for d in ResearchDomain}
+
+
+def _intern_domain(domain: str) -> str:
+    """Get the canonical interned string for a domain name"""
+    return DOMAINS.get(domain) or sys.intern(domain)
+
+
+@dataclass(slots=True)
 class VirusNode:
     """Root virus node"""
     id: str
@@ -39,7 +77,7 @@ class VirusNode:
     genome_kb: float
 
 
-@dataclass
+@dataclass(slots=True)
 class VirologyNode:
     """Biology/virology node (spike protein, etc.)"""
     id: str
@@ -47,7 +85,7 @@ class VirologyNode:
     details: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ImmunologyNode:
     """Immunology node (antibody response, etc.)"""
     id: str
@@ -55,15 +93,100 @@ class ImmunologyNode:
     details: str
 
 
-@dataclass
+# Amino-acid substitutions such as "L452R" pack into one uint32:
+# 5 bits from-residue | 22 bits position | 5 bits to-residue
+_RESIDUES = "ABCDEFGHIJKLMNOPQRSTUVWXYZ*"
+_SUBSTITUTION_RE = re.compile(r"([A-Z*])([1-9][0-9]{0,6})([A-Z*])")
+_MAX_POSITION = (1 << 22) - 1
+
+
+def _encode_mutation(mutation: str) -> Optional[int]:
+    """Pack a substitution like "L452R" into a uint32 (None if not a plain substitution)"""
+    match = _SUBSTITUTION_RE.fullmatch(mutation)
+    if match is None or int(match[2]) > _MAX_POSITION:
+        return None
+    return (_RESIDUES.index(match[1]) << 27) | (int(match[2]) << 5) | _RESIDUES.index(match[3])
+
+
+def _decode_mutation(code: int) -> str:
+    """Unpack a uint32 from _encode_mutation back to its string form"""
+    return f"{_RESIDUES[code >> 27]}{(code >> 5) & _MAX_POSITION}{_RESIDUES[code & 0x1F]}"
+
+
+class PackedMutations(array):
+    """
+    Mutation list stored as packed uint32 codes (4 bytes per mutation)
+    
+    Reads like the list of strings it replaces: indexing, iteration,
+    membership and comparison with a list all use the decoded mutations.
+    """
+    
+    __slots__ = ()
+    
+    def __new__(cls, codes=()):
+        return super().__new__(cls, "I", codes)
+    
+    def __reduce__(self):
+        return (PackedMutations, (self.tolist(),))
+    
+    def __reduce_ex__(self, protocol):
+        # array defines __reduce_ex__, which would otherwise bypass __reduce__
+        return self.__reduce__()
+    
+    def __copy__(self):
+        return PackedMutations(self.tolist())
+    
+    def __deepcopy__(self, memo):
+        return PackedMutations(self.tolist())
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_decode_mutation(code) for code in super().__getitem__(index)]
+        return _decode_mutation(super().__getitem__(index))
+    
+    def __iter__(self):
+        return map(_decode_mutation, super().__iter__())
+    
+    def __contains__(self, mutation) -> bool:
+        if isinstance(mutation, str):
+            mutation = _encode_mutation(mutation)
+        return super().__contains__(mutation)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, array):
+            return super().__eq__(other)
+        return self.decode() == other
+    
+    def __ne__(self, other) -> bool:
+        return not self == other
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"PackedMutations({self.decode()!r})"
+    
+    def decode(self) -> List[str]:
+        """Mutations as strings"""
+        return [_decode_mutation(code) for code in self.tolist()]
+
+
+def pack_mutations(mutations: List[str]) -> Union[PackedMutations, List[str]]:
+    """Pack mutations if all are plain substitutions, else return them unchanged"""
+    codes = [_encode_mutation(m) for m in mutations]
+    if None in codes:
+        return mutations
+    return PackedMutations(codes)
+
+
+@dataclass(slots=True)
 class GenomicsNode:
     """Variant/genomics node"""
     id: str
     variant: str
-    mutations: List[str]
+    mutations: Union[PackedMutations, List[str]]
 
 
-@dataclass
+@dataclass(slots=True)
 class TreatmentNode:
     """Treatment node"""
     id: str
@@ -71,7 +194,7 @@ class TreatmentNode:
     mechanism: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PublicHealthNode:
     """Public health policy node"""
     id: str
@@ -79,7 +202,7 @@ class PublicHealthNode:
     effect: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """Edge connecting nodes"""
     id: str
@@ -94,7 +217,7 @@ class GraphEdge:
     confidence: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HypothesisPath:
     """Path through graph representing a hypothesis"""
     id: str
@@ -106,7 +229,7 @@ class HypothesisPath:
     evidence_coverage: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ExplorationStep:
     """Single step in serendipity trace"""
     id: str
@@ -119,28 +242,129 @@ class ExplorationStep:
     timestamp: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SerendipityTrace:
     """Complete exploration trace"""
     id: str
     session_id: str
     question: str
-    steps: List[ExplorationStep]
+    steps: Deque[ExplorationStep]
     total_evidence: int
     cross_domain_jumps: int
+    _last_domains: Optional[frozenset] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class RDPoint:
     """Rate-distortion point"""
     rate: float
     distortion: float
 
 
-@dataclass
 class RDCurve:
-    """Rate-distortion curve"""
-    points: List[RDPoint]
+    """
+    Rate-distortion curve stored as parallel float64 arrays
+    
+    Deliberately not a dataclass, so that both JSON encoders hand it to
+    _json_default, which exports it as {"points": [{"rate", "distortion"}]}.
+    """
+    
+    __slots__ = ("rates", "distortions")
+    
+    def __init__(self, rates: array, distortions: array):
+        self.rates = rates
+        self.distortions = distortions
+    
+    def __repr__(self) -> str:
+        return f"RDCurve(rates={self.rates!r}, distortions={self.distortions!r})"
+    
+    @property
+    def points(self) -> List[RDPoint]:
+        """Curve as a list of RDPoint"""
+        return [RDPoint(rate=r, distortion=d) for r, d in zip(self.rates, self.distortions)]
+
+
+class NodeView(Mapping):
+    """Read-only mapping of node id -> {"type", "data", "intent"} over the node arrays"""
+    
+    __slots__ = ("_graph",)
+    
+    def __init__(self, graph: "SARSCoV2MultiIntentGraph"):
+        self._graph = graph
+    
+    def __getitem__(self, node_id: str) -> Dict[str, Any]:
+        graph = self._graph
+        return graph._node_record(graph._id_to_idx[node_id])
+    
+    def __iter__(self):
+        return iter(self._graph.node_ids)
+    
+    def __len__(self) -> int:
+        return len(self._graph.node_ids)
+
+
+# Field names per dataclass type, filled lazily by _json_default
+_FIELD_NAMES: Dict[type, tuple] = {}
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert a dataclass to a shallow dict (arrays and deques to lists) for JSON encoding"""
+    names = _FIELD_NAMES.get(type(obj))
+    if names is None:
+        if isinstance(obj, RDCurve):
+            return {"points": [
+                {"rate": rate, "distortion": distortion}
+                for rate, distortion in zip(obj.rates, obj.distortions)
+            ]}
+        if isinstance(obj, PackedMutations):
+            return obj.decode()
+        if isinstance(obj, array):
+            return obj.tolist()
+        if isinstance(obj, deque):
+            return list(obj)
+        if not is_dataclass(obj):
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        # Underscore fields are internal state and are skipped, as orjson does
+        names = _FIELD_NAMES[type(obj)] = tuple(
+            f.name for f in fields(obj) if not f.name.startswith("_")
+        )
+    return {name: getattr(obj, name) for name in names}
+
+
+# ensure_ascii=False writes non-ASCII text as UTF-8, as orjson does
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=_json_default)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode obj as indented UTF-8 JSON bytes (uses orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS
+        )
+    return _ENCODER.encode(obj).encode()
+
+
+def _section_chunks(name: str, entries, keyed: bool):
+    """Yield the JSON bytes of one top-level export section, one entry at a time"""
+    yield b',\n  "' + name.encode() + (b'": {' if keyed else b'": [')
+    sep = b"\n    "
+    for entry in entries:
+        if keyed:
+            key, entry = entry
+            yield sep + _dumps(key) + b": " + _dumps(entry).replace(b"\n", b"\n    ")
+        else:
+            yield sep + _dumps(entry).replace(b"\n", b"\n    ")
+        sep = b",\n    "
+    if sep != b"\n    ":
+        yield b"\n  "
+    yield b"}" if keyed else b"]"
+
+
+def _encode_section(name: str, entries, keyed: bool) -> bytes:
+    """Encode a whole export section (runs in a worker process)"""
+    return b"".join(_section_chunks(name, entries, keyed))
 
 
 class SARSCoV2MultiIntentGraph:
@@ -150,61 +374,167 @@ class SARSCoV2MultiIntentGraph:
     """
     
     def __init__(self):
-        self.id = str(uuid.uuid4())
-        self.nodes: Dict[str, Any] = {}
+        # Nodes are stored as parallel arrays; _id_to_idx maps a node id to
+        # its row, and node_ids maps a row back to the id
+        self.node_ids: List[str] = []
+        self.node_types = array("B")
+        self.node_intents: List[str] = []
+        self.node_data: List[Any] = []
+        self._id_to_idx: Dict[str, int] = {}
+        self._intent_index: Dict[str, List[int]] = defaultdict(list)
+        self.nodes = NodeView(self)
+        
         self.edges: Dict[str, GraphEdge] = {}
+        self._out_edges: Dict[str, List[str]] = defaultdict(list)
+        self._in_edges: Dict[str, List[str]] = defaultdict(list)
         self.hypothesis_paths: List[HypothesisPath] = []
         self.serendipity_traces: List[SerendipityTrace] = []
         self.rd_curves: Dict[str, RDCurve] = {}
+        self._id_pool: deque = deque()
+        self.id = self._next_id()
+        
+        # Statistics counters, maintained on insert
+        self._n_causal = 0
+        self._n_correlative = 0
+        self._n_cross_domain = 0
+        self._domain_set: set = set()
+        self._stats_cache: Dict[str, Any] = {}
+        self._stats_dirty = True
         
+    def _refill_ids(self, count: int):
+        """Add count 32-char hex identifiers to the pool from one os.urandom() call"""
+        raw = binascii.hexlify(os.urandom(16 * count)).decode("ascii")
+        self._id_pool.extend(raw[i:i + 32] for i in range(0, len(raw), 32))
+    
+    def _next_id(self) -> str:
+        """Get a unique identifier from the pre-generated pool"""
+        if not self._id_pool:
+            self._refill_ids(ID_BATCH_SIZE)
+        return self._id_pool.popleft()
+    
+    def _take_ids(self, n: int) -> List[str]:
+        """Get n unique identifiers from the pool at once"""
+        pool = self._id_pool
+        if len(pool) < n:
+            self._refill_ids(max(n - len(pool), ID_BATCH_SIZE))
+        return [pool.popleft() for _ in range(n)]
+    
+    def _add_node(self, node: Any, node_type: str, intent: str):
+        """Append node to the node arrays"""
+        self._id_to_idx[node.id] = len(self.node_ids)
+        self.node_ids.append(node.id)
+        self.node_types.append(_NODE_TYPE_CODES[node_type])
+        self.node_intents.append(intent)
+        self.node_data.append(node)
+        self._intent_index[intent].append(len(self.node_ids) - 1)
+        self._domain_set.add(node_type)
+        self._stats_dirty = True
+    
+    def _add_edge(self, edge: GraphEdge):
+        """Store edge and update adjacency indices and statistics counters"""
+        self.edges[edge.id] = edge
+        self._out_edges[edge.source_id].append(edge.id)
+        self._in_edges[edge.target_id].append(edge.id)
+        
+        if edge.edge_type == "Causal":
+            self._n_causal += 1
+        else:
+            self._n_correlative += 1
+        if edge.source_domain != edge.target_domain:
+            self._n_cross_domain += 1
+        self._stats_dirty = True
+    
+    def _add_edges(self, edges: Sequence[GraphEdge]):
+        """Batch version of _add_edge, filling each index in one pass"""
+        self.edges.update((edge.id, edge) for edge in edges)
+        out_edges = self._out_edges
+        in_edges = self._in_edges
+        for edge in edges:
+            out_edges[edge.source_id].append(edge.id)
+            in_edges[edge.target_id].append(edge.id)
+        
+        n_causal = sum(edge.edge_type == "Causal" for edge in edges)
+        self._n_causal += n_causal
+        self._n_correlative += len(edges) - n_causal
+        self._n_cross_domain += sum(edge.source_domain != edge.target_domain for edge in edges)
+        self._stats_dirty = True
+    
+    def variants_with_mutation(self, mutation: str) -> List[GenomicsNode]:
+        """Get genomics nodes whose variant carries mutation (e.g. "L452R")"""
+        genomics = _NODE_TYPE_CODES["genomics"]
+        return [
+            node for node_type, node in zip(self.node_types, self.node_data)
+            if node_type == genomics and mutation in node.mutations
+        ]
+    
+    def _node_record(self, idx: int) -> Dict[str, Any]:
+        """Build the {"type", "data", "intent"} record for node row idx"""
+        return {
+            "type": NODE_TYPES[self.node_types[idx]],
+            "data": self.node_data[idx],
+            "intent": self.node_intents[idx]
+        }
+    
+    def nodes_with_intent(self, intent: str) -> List[Dict[str, Any]]:
+        """Get node records tagged with intent, in insertion order"""
+        return [self._node_record(idx) for idx in self._intent_index.get(intent, ())]
+    
+    def neighbors_out(self, node_id: str) -> List[str]:
+        """Get ids of edges leaving node_id"""
+        return self._out_edges.get(node_id, [])
+    
+    def neighbors_in(self, node_id: str) -> List[str]:
+        """Get ids of edges entering node_id"""
+        return self._in_edges.get(node_id, [])
+    
     def add_virology_node(self, topic: str, details: str, intent: str = "transmissibility") -> VirologyNode:
         """Add biology/virology node (spike protein, etc.)"""
         node = VirologyNode(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             topic=topic,
             details=details
         )
-        self.nodes[node.id] = {"type": "virology", "data": node, "intent": intent}
+        self._add_node(node, "virology", intent)
         return node
     
     def add_immunology_node(self, topic: str, details: str, intent: str = "vaccine_efficacy") -> ImmunologyNode:
         """Add immunology node (antibody response, etc.)"""
         node = ImmunologyNode(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             topic=topic,
             details=details
         )
-        self.nodes[node.id] = {"type": "immunology", "data": node, "intent": intent}
+        self._add_node(node, "immunology", intent)
         return node
     
     def add_variant_node(self, variant: str, mutations: List[str], intent: str = "immune_escape") -> GenomicsNode:
         """Add variant/genomics node (Omicron, etc.)"""
         node = GenomicsNode(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             variant=variant,
-            mutations=mutations
+            mutations=pack_mutations(mutations)
         )
-        self.nodes[node.id] = {"type": "genomics", "data": node, "intent": intent}
+        self._add_node(node, "genomics", intent)
         return node
     
     def add_treatment_node(self, therapy: str, mechanism: str, intent: str = "treatment_efficacy") -> TreatmentNode:
         """Add treatment node (Paxlovid, etc.)"""
         node = TreatmentNode(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             therapy=therapy,
             mechanism=mechanism
         )
-        self.nodes[node.id] = {"type": "treatment", "data": node, "intent": intent}
+        self._add_node(node, "treatment", intent)
         return node
     
     def add_public_health_node(self, policy: str, effect: str, intent: str = "transmission_reduction") -> PublicHealthNode:
         """Add public health policy node"""
         node = PublicHealthNode(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             policy=policy,
             effect=effect
         )
-        self.nodes[node.id] = {"type": "public_health", "data": node, "intent": intent}
+        self._add_node(node, "public_health", intent)
         return node
     
     def add_causal_edge(
@@ -219,18 +549,18 @@ class SARSCoV2MultiIntentGraph:
     ) -> GraphEdge:
         """Add causal edge (mutation → immune escape)"""
         edge = GraphEdge(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             edge_type="Causal",
             source_id=source_id,
             target_id=target_id,
             label=label,
             weight=confidence,
-            source_domain=source_domain,
-            target_domain=target_domain,
+            source_domain=_intern_domain(source_domain),
+            target_domain=_intern_domain(target_domain),
             evidence_refs=evidence_refs,
             confidence=confidence
         )
-        self.edges[edge.id] = edge
+        self._add_edge(edge)
         return edge
     
     def add_correlative_edge(
@@ -244,24 +574,66 @@ class SARSCoV2MultiIntentGraph:
         correlation: float
     ) -> GraphEdge:
         """Add correlative edge (treatment → reduced hospitalization)"""
+        strength = abs(correlation)
         edge = GraphEdge(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             edge_type="Correlative",
             source_id=source_id,
             target_id=target_id,
             label=label,
-            weight=abs(correlation),
-            source_domain=source_domain,
-            target_domain=target_domain,
+            weight=strength,
+            source_domain=_intern_domain(source_domain),
+            target_domain=_intern_domain(target_domain),
             evidence_refs=evidence_refs,
-            confidence=abs(correlation)
+            confidence=strength
         )
-        self.edges[edge.id] = edge
+        self._add_edge(edge)
         return edge
     
+    def add_causal_edges_bulk(self, records: List[tuple]) -> List[GraphEdge]:
+        """
+        Add many causal edges at once
+        
+        Each record is (source_id, target_id, label, source_domain,
+        target_domain, evidence_refs, confidence), as for add_causal_edge.
+        """
+        ids = self._take_ids(len(records))
+        edges = [
+            GraphEdge(
+                edge_id, "Causal", source_id, target_id, label, confidence,
+                _intern_domain(source_domain), _intern_domain(target_domain),
+                evidence_refs, confidence
+            )
+            for edge_id, (source_id, target_id, label, source_domain, target_domain,
+                          evidence_refs, confidence) in zip(ids, records)
+        ]
+        self._add_edges(edges)
+        return edges
+    
+    def add_correlative_edges_bulk(self, records: List[tuple]) -> List[GraphEdge]:
+        """
+        Add many correlative edges at once
+        
+        Each record is (source_id, target_id, label, source_domain,
+        target_domain, evidence_refs, correlation), as for add_correlative_edge.
+        """
+        ids = self._take_ids(len(records))
+        strengths = list(map(abs, [record[6] for record in records]))
+        edges = [
+            GraphEdge(
+                edge_id, "Correlative", source_id, target_id, label, strength,
+                _intern_domain(source_domain), _intern_domain(target_domain),
+                evidence_refs, strength
+            )
+            for edge_id, strength, (source_id, target_id, label, source_domain, target_domain,
+                                    evidence_refs, _) in zip(ids, strengths, records)
+        ]
+        self._add_edges(edges)
+        return edges
+    
     def add_hypothesis_path(
         self,
-        hypothesis_type: HypothesisType,
+        hypothesis_type: Union[HypothesisType, str],
         description: str,
         node_sequence: List[str],
         edge_sequence: List[str],
@@ -270,8 +642,8 @@ class SARSCoV2MultiIntentGraph:
     ) -> HypothesisPath:
         """Add hypothesis exploration path"""
         path = HypothesisPath(
-            id=str(uuid.uuid4()),
-            hypothesis_type=hypothesis_type.value,
+            id=self._next_id(),
+            hypothesis_type=_HYP_VAL.get(hypothesis_type, hypothesis_type),
             description=description,
             node_sequence=node_sequence,
             edge_sequence=edge_sequence,
@@ -279,96 +651,134 @@ class SARSCoV2MultiIntentGraph:
             evidence_coverage=coverage
         )
         self.hypothesis_paths.append(path)
+        self._stats_dirty = True
         return path
     
     def create_serendipity_trace(self, session_id: str, question: str) -> SerendipityTrace:
         """Create new serendipity trace for exploration"""
         trace = SerendipityTrace(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             session_id=session_id,
             question=question,
-            steps=[],
+            steps=deque(),
             total_evidence=0,
             cross_domain_jumps=0
         )
         self.serendipity_traces.append(trace)
+        self._stats_dirty = True
         return trace
     
     def add_exploration_step(
         self,
         trace: SerendipityTrace,
-        hypothesis: HypothesisType,
+        hypothesis: Union[HypothesisType, str],
         query: str,
         domains: List[str],
         evidence_count: int,
-        confidence: float
+        confidence: float,
+        batch_timestamp: Optional[str] = None
     ):
-        """Add step to serendipity trace"""
+        """
+        Add step to serendipity trace
+        
+        Pass batch_timestamp (e.g. from _timestamp()) to share one timestamp
+        across a batch of steps instead of formatting a new one per step.
+        """
         step = ExplorationStep(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             step_number=len(trace.steps) + 1,
-            hypothesis=hypothesis.value,
+            hypothesis=_HYP_VAL.get(hypothesis, hypothesis),
             query=query,
             domains_explored=domains,
             evidence_found=evidence_count,
             confidence=confidence,
-            timestamp=self._timestamp()
+            timestamp=batch_timestamp or self._timestamp()
         )
         trace.steps.append(step)
         trace.total_evidence += evidence_count
         
-        # Detect cross-domain jumps
-        if len(trace.steps) > 1:
-            prev_domains = trace.steps[-2].domains_explored
-            if prev_domains != domains:
-                trace.cross_domain_jumps += 1
+        # Detect cross-domain jumps against the previous step's domain set
+        domain_set = frozenset(domains)
+        if trace._last_domains is not None and trace._last_domains != domain_set:
+            trace.cross_domain_jumps += 1
+        trace._last_domains = domain_set
     
     def add_rd_curve(self, intent: str, batch_sizes: List[int], redundancies: List[float]):
         """Add rate-distortion curve for intent"""
-        points = [
-            RDPoint(rate=float(size), distortion=redundancy)
-            for size, redundancy in zip(batch_sizes, redundancies)
-        ]
-        self.rd_curves[intent] = RDCurve(points=points)
+        rates = array("d")
+        distortions = array("d")
+        for size, redundancy in zip(batch_sizes, redundancies):
+            rates.append(size)
+            distortions.append(redundancy)
+        self.rd_curves[intent] = RDCurve(rates, distortions)
+        self._stats_dirty = True
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Calculate graph statistics"""
-        causal_edges = sum(1 for e in self.edges.values() if e.edge_type == "Causal")
-        correlative_edges = sum(1 for e in self.edges.values() if e.edge_type == "Correlative")
-        cross_domain = sum(1 for e in self.edges.values() if e.source_domain != e.target_domain)
-        
-        return {
+        """Calculate graph statistics (cached until the graph changes)"""
+        if not self._stats_dirty:
+            return dict(self._stats_cache)
+        self._stats_cache = {
             "total_nodes": len(self.nodes),
             "total_edges": len(self.edges),
-            "causal_edges": causal_edges,
-            "correlative_edges": correlative_edges,
-            "cross_domain_edges": cross_domain,
+            "causal_edges": self._n_causal,
+            "correlative_edges": self._n_correlative,
+            "cross_domain_edges": self._n_cross_domain,
             "hypothesis_paths": len(self.hypothesis_paths),
             "serendipity_traces": len(self.serendipity_traces),
             "rd_curves": len(self.rd_curves),
-            "domains_covered": len(set(n["type"] for n in self.nodes.values()))
+            "domains_covered": len(self._domain_set)
         }
+        self._stats_dirty = False
+        return dict(self._stats_cache)
     
-    def export_json(self, filepath: str):
-        """Export graph to JSON"""
-        data = {
-            "id": self.id,
-            "nodes": {k: {"type": v["type"], "intent": v["intent"], "data": asdict(v["data"])} 
-                     for k, v in self.nodes.items()},
-            "edges": {k: asdict(v) for k, v in self.edges.items()},
-            "hypothesis_paths": [asdict(p) for p in self.hypothesis_paths],
-            "serendipity_traces": [asdict(t) for t in self.serendipity_traces],
-            "rd_curves": {k: asdict(v) for k, v in self.rd_curves.items()},
-            "statistics": self.get_statistics()
-        }
+    def export_json(self, filepath: str, workers: int = 0):
+        """
+        Export graph to JSON
+        
+        By default sections are streamed to disk one entry at a time, without
+        building one big dict. With workers > 1 the sections are encoded
+        concurrently in a process pool instead. That holds the encoded
+        sections in memory and pays for pickling the graph to the workers,
+        so it only helps for large graphs on multi-core machines, mainly
+        when orjson is not installed.
+        
+        The file is UTF-8 with non-ASCII text written unescaped, whichever
+        encoder is used. The only difference orjson makes is the spelling
+        of floats in exponent form (1e-05 vs 0.00001, 1e+16 vs 1e16).
+        """
+        nodes = (
+            (k, {"type": NODE_TYPES[t], "intent": intent, "data": node})
+            for k, t, intent, node in zip(
+                self.node_ids, self.node_types, self.node_intents, self.node_data
+            )
+        )
+        sections = [
+            ("nodes", nodes, True),
+            ("edges", self.edges.items(), True),
+            ("hypothesis_paths", self.hypothesis_paths, False),
+            ("serendipity_traces", self.serendipity_traces, False),
+            ("rd_curves", self.rd_curves.items(), True),
+        ]
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(b'{\n  "id": ' + _dumps(self.id))
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(sections))) as ex:
+                    futures = [
+                        ex.submit(_encode_section, name, list(entries), keyed)
+                        for name, entries, keyed in sections
+                    ]
+                    for future in futures:
+                        f.write(future.result())
+            else:
+                for name, entries, keyed in sections:
+                    f.writelines(_section_chunks(name, entries, keyed))
+            f.write(b',\n  "statistics": ' + _dumps(self.get_statistics()).replace(b"\n", b"\n  "))
+            f.write(b"\n}")
     
     def _timestamp(self) -> str:
         """Get current timestamp"""
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + "Z"
+        return datetime.utcnow().isoformat(timespec="seconds") + "Z"
 
 
 def create_example_graph() -> SARSCoV2MultiIntentGraph:
@@ -9,10 +9,26 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+import base64
 import json
-from dataclasses import dataclass
-import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+import itertools
+import operator
+import struct
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import from Rust Python integration
 rust_module_path = os.path.join(
@@ -33,6 +49,127 @@ except ImportError:
     RUST_AVAILABLE = False
     print("Warning: Rust Python integration not available. Using fallback implementation.")
 
+if RUST_AVAILABLE:
+    # Lowercased HypothesisType member name -> member, for explore_hypothesis
+    _HYP_MAP = {name.lower(): member for name, member in HypothesisType.__members__.items()}
+
+
+# Keyword-based intent detection
+INTENT_KEYWORDS = {
+    "transmissibility": ["transmit", "spread", "contagious", "infection rate"],
+    "vaccine_efficacy": ["vaccine", "vaccination", "immunization", "efficacy"],
+    "immune_escape": ["escape", "evade", "antibody", "neutralization"],
+    "treatment_efficacy": ["treatment", "therapy", "drug", "medication"],
+    "transmission_reduction": ["mask", "policy", "mandate", "intervention"]
+}
+
+# Keyword-based domain inference, checked in order (first match wins)
+DOMAIN_KEYWORDS = {
+    "Virology": ["spike", "protein", "viral", "virus"],
+    "Immunology": ["antibody", "immune", "t-cell"],
+    "Genomics": ["variant", "mutation", "omicron", "delta"],
+    "Treatment": ["treatment", "drug", "therapy", "paxlovid"],
+    "PublicHealth": ["policy", "mask", "mandate", "public health"]
+}
+
+# Keyword tables as tuples of (label, keywords) for the hot matching loops
+_KEYWORD_TABLES = {
+    "intent": tuple((intent, tuple(words)) for intent, words in INTENT_KEYWORDS.items()),
+    "domain": tuple((domain, tuple(words)) for domain, words in DOMAIN_KEYWORDS.items())
+}
+
+
+def _build_keyword_automaton():
+    """Build one Aho-Corasick automaton over all intent and domain keywords"""
+    payloads: Dict[str, List[Tuple[str, str]]] = {}
+    for category, table in _KEYWORD_TABLES.items():
+        for label, words in table:
+            for word in words:
+                payloads.setdefault(word, []).append((category, label))
+    
+    automaton = ahocorasick.Automaton()
+    for word, labels in payloads.items():
+        automaton.add_word(word, tuple(labels))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick is not None else None
+
+
+def _match_keywords(text_lower: str, category: str) -> Iterator[str]:
+    """
+    Yield labels of a keyword category ("intent" or "domain") matched in text
+    
+    Uses the Aho-Corasick automaton (one pass over the text) when
+    pyahocorasick is installed, lazy substring checks otherwise. Labels are
+    yielded in keyword-table order either way.
+    """
+    table = _KEYWORD_TABLES[category]
+    if _KEYWORD_AUTOMATON is not None:
+        found = {
+            label
+            for _, labels in _KEYWORD_AUTOMATON.iter(text_lower)
+            for label_category, label in labels
+            if label_category == category
+        }
+        return (label for label, _ in table if label in found)
+    return (label for label, words in table if any(word in text_lower for word in words))
+
+
+@lru_cache(maxsize=4096)
+def _infer_domain_cached(text: str) -> str:
+    """Infer research domain from text (memoized, descriptions repeat across edges)"""
+    return next(_match_keywords(text.lower(), "domain"), "Virology")
+
+
+def _knee_index(rates: Sequence[float], distortions: Sequence[float]) -> int:
+    """Index minimizing rate + distortion (first one on ties)"""
+    combined = list(map(operator.add, rates, distortions))
+    return combined.index(min(combined))
+
+
+def _new_id() -> str:
+    """Random 128-bit identifier as 22 url-safe base64 characters"""
+    return base64.urlsafe_b64encode(os.urandom(16)).rstrip(b"=").decode("ascii")
+
+
+_F32 = struct.Struct("f")
+
+
+@lru_cache(maxsize=4096)
+def _f32_to_float(value: float) -> float:
+    """Round value to float32 and return the shortest decimal for it (0.87, not 0.8700000047683716)"""
+    value = _F32.unpack(_F32.pack(value))[0]
+    for digits in (6, 7, 8):
+        candidate = float(f"{value:.{digits}g}")
+        if _F32.unpack(_F32.pack(candidate))[0] == value:
+            return candidate
+    return float(f"{value:.9g}")
+
+
+@dataclass(frozen=True, slots=True)
+class _QCtx:
+    """Query text with its lowercased form and tokens, computed once per request"""
+    text: str
+    lower: str
+    tokens: Tuple[str, ...]
+
+
+@lru_cache(maxsize=1024)
+def _query_context(text: str) -> _QCtx:
+    """Get the (shared, immutable) _QCtx for a query; hypothesis loops repeat queries"""
+    return _QCtx(text, text.lower(), tuple(text.split()))
+
+
+@dataclass(slots=True)
+class _Trace:
+    """Serendipity trace of the fallback graph"""
+    id: str
+    session_id: str
+    question: str
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+
 
 class SARSCoV2ResearchAgent:
     """
@@ -40,32 +177,76 @@ class SARSCoV2ResearchAgent:
     Integrates with Quantum LIMIT Graph and main research agent
     """
     
-    def __init__(self, use_rust: bool = True):
+    __slots__ = (
+        "use_rust", "intent_workers", "graph", "session_id",
+        "current_trace", "_id_counter"
+    )
+    
+    def __init__(self, use_rust: bool = True, intent_workers: int = 0):
         """
         Initialize SARS-CoV-2 research agent
         
         Args:
             use_rust: Whether to use Rust backend (faster) or Python fallback
+            intent_workers: Threads for querying intents concurrently in
+                    query_multi_intent (0 or 1 queries them in turn). Only
+                    worth it when intent queries block on I/O or release
+                    the GIL, e.g. with an external evidence retriever.
         """
         self.use_rust = use_rust and RUST_AVAILABLE
+        self.intent_workers = intent_workers
         
         if self.use_rust:
             self.graph = SARSCoV2MultiIntentGraph()
         else:
             self.graph = self._create_fallback_graph()
         
-        self.session_id = str(uuid.uuid4())
+        self.session_id = _new_id()
         self.current_trace = None
+        self._id_counter = itertools.count()
+        
+    def _next_id(self) -> str:
+        """Get the next per-agent node/edge/trace identifier"""
+        return f"n{next(self._id_counter)}"
         
     def _create_fallback_graph(self):
-        """Create fallback Python-only graph"""
+        """
+        Create fallback Python-only graph
+        
+        Edges are stored as parallel columns, with confidences as float32
+        """
         return {
             "nodes": {},
-            "edges": {},
+            "edges": {
+                "id": [],
+                "source": [],
+                "target": [],
+                "type": [],
+                "relationship": [],
+                "confidence": array("f")
+            },
             "traces": [],
             "rd_curves": {}
         }
     
+    def _fallback_edges(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild id -> edge dict from the fallback graph's edge columns"""
+        edges = self.graph["edges"]
+        return {
+            edge_id: {
+                "id": edge_id,
+                "source": source,
+                "target": target,
+                "type": edge_type,
+                "relationship": relationship,
+                "confidence": _f32_to_float(confidence)
+            }
+            for edge_id, source, target, edge_type, relationship, confidence in zip(
+                edges["id"], edges["source"], edges["target"],
+                edges["type"], edges["relationship"], edges["confidence"]
+            )
+        }
+    
     def query_multi_intent(
         self,
         question: str,
@@ -83,7 +264,7 @@ class SARSCoV2ResearchAgent:
             Dict with nodes, edges, paths, and evidence
         """
         if not intents:
-            intents = self._decompose_question(question)
+            intents = self._decompose_question(_query_context(question))
         
         results = {
             "question": question,
@@ -96,37 +277,35 @@ class SARSCoV2ResearchAgent:
         }
         
         # Query each intent
-        for intent in intents:
-            intent_results = self._query_intent(intent, question)
-            results["nodes"].extend(intent_results["nodes"])
+        if self.intent_workers > 1 and len(intents) > 1:
+            workers = min(self.intent_workers, len(intents))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                all_results = list(executor.map(
+                    self._query_intent, intents, itertools.repeat(question)
+                ))
+        else:
+            all_results = [self._query_intent(intent, question) for intent in intents]
+        
+        # Merge intent results, summing node confidences along the way
+        nodes = results["nodes"]
+        total_confidence = 0.0
+        for intent_results in all_results:
+            intent_nodes = intent_results["nodes"]
+            nodes.extend(intent_nodes)
+            for node in intent_nodes:
+                total_confidence += node.get("confidence", 0.0)
             results["edges"].extend(intent_results["edges"])
             results["evidence_count"] += intent_results["evidence_count"]
         
         # Calculate average confidence
-        if results["nodes"]:
-            results["confidence"] = sum(
-                n.get("confidence", 0.0) for n in results["nodes"]
-            ) / len(results["nodes"])
+        if nodes:
+            results["confidence"] = total_confidence / len(nodes)
         
         return results
     
-    def _decompose_question(self, question: str) -> List[str]:
+    def _decompose_question(self, ctx: _QCtx) -> List[str]:
         """Decompose question into research intents"""
-        intents = []
-        
-        # Keyword-based intent detection
-        keywords = {
-            "transmissibility": ["transmit", "spread", "contagious", "infection rate"],
-            "vaccine_efficacy": ["vaccine", "vaccination", "immunization", "efficacy"],
-            "immune_escape": ["escape", "evade", "antibody", "neutralization"],
-            "treatment_efficacy": ["treatment", "therapy", "drug", "medication"],
-            "transmission_reduction": ["mask", "policy", "mandate", "intervention"]
-        }
-        
-        question_lower = question.lower()
-        for intent, words in keywords.items():
-            if any(word in question_lower for word in words):
-                intents.append(intent)
+        intents = list(_match_keywords(ctx.lower, "intent"))
         
         # Default to transmissibility if no intents found
         if not intents:
@@ -149,10 +328,7 @@ class SARSCoV2ResearchAgent:
         
         # Retrieve nodes from graph
         if self.use_rust:
-            nodes = [
-                n for n in self.graph.nodes.values()
-                if n.get("intent") == intent
-            ]
+            nodes = self.graph.nodes_with_intent(intent)
         else:
             nodes = self.graph["nodes"].get(intent, [])
         
@@ -186,12 +362,12 @@ class SARSCoV2ResearchAgent:
             self.current_trace = self._create_trace(query)
         
         # Simulate evidence retrieval
-        evidence_count = self._retrieve_evidence(query, domains)
+        evidence_count = self._retrieve_evidence(_query_context(query), domains)
         confidence = min(0.95, 0.6 + (evidence_count * 0.05))
         
         # Add exploration step
         if self.use_rust:
-            hyp_type = getattr(HypothesisType, hypothesis_type.upper(), HypothesisType.TRANSMISSIBILITY)
+            hyp_type = _HYP_MAP.get(hypothesis_type.lower(), HypothesisType.TRANSMISSIBILITY)
             self.graph.add_exploration_step(
                 self.current_trace,
                 hyp_type,
@@ -215,21 +391,16 @@ class SARSCoV2ResearchAgent:
         if self.use_rust:
             return self.graph.create_serendipity_trace(self.session_id, question)
         else:
-            trace = {
-                "id": str(uuid.uuid4()),
-                "session_id": self.session_id,
-                "question": question,
-                "steps": []
-            }
+            trace = _Trace(self._next_id(), self.session_id, question)
             self.graph["traces"].append(trace)
             return trace
     
-    def _retrieve_evidence(self, query: str, domains: List[str]) -> int:
+    def _retrieve_evidence(self, ctx: _QCtx, domains: List[str]) -> int:
         """Simulate evidence retrieval (replace with actual retrieval)"""
         # Simple heuristic: more domains = more evidence
         base_evidence = 5
         domain_bonus = len(domains) * 3
-        query_bonus = len(query.split()) // 2
+        query_bonus = len(ctx.tokens) // 2
         return base_evidence + domain_bonus + query_bonus
     
     def compute_rd_curve(
@@ -247,10 +418,9 @@ class SARSCoV2ResearchAgent:
         Returns:
             R-D curve with optimal operating point
         """
-        # Simulate distortion calculation
-        redundancies = [
-            max(0.1, 1.0 - (size * 0.03)) for size in batch_sizes
-        ]
+        # Simulate distortion calculation (linear decay, floored at 0.1)
+        redundancies = [1.0 - size * 0.03 for size in batch_sizes]
+        redundancies = [r if r > 0.1 else 0.1 for r in redundancies]
         
         if self.use_rust:
             self.graph.add_rd_curve(intent, batch_sizes, redundancies)
@@ -269,11 +439,10 @@ class SARSCoV2ResearchAgent:
             "recommendation": f"Use batch size {batch_sizes[knee_idx]} for optimal coverage/quality"
         }
     
-    def _find_knee_point(self, rates: List[float], distortions: List[float]) -> int:
-        """Find knee point in R-D curve"""
+    def _find_knee_point(self, rates: Sequence[float], distortions: Sequence[float]) -> int:
+        """Find knee point in R-D curve (accepts lists or array.array columns)"""
         # Simple heuristic: minimize rate + distortion
-        combined = [r + d for r, d in zip(rates, distortions)]
-        return combined.index(min(combined))
+        return _knee_index(rates, distortions)
     
     def add_causal_relationship(
         self,
@@ -295,7 +464,14 @@ class SARSCoV2ResearchAgent:
         
         Returns:
             Edge information
+        
+        Raises:
+            ValueError: If confidence is not a number in [0, 1]
         """
+        # Reject before touching the graph; the comparison is also False for NaN
+        if isinstance(confidence, bool) or not 0.0 <= confidence <= 1.0:
+            raise ValueError(f"confidence must be a number in [0, 1], got {confidence!r}")
+        
         # Create nodes if needed
         source_id = self._get_or_create_node(source)
         target_id = self._get_or_create_node(target)
@@ -322,56 +498,102 @@ class SARSCoV2ResearchAgent:
             }
         else:
             edge = {
-                "id": str(uuid.uuid4()),
+                "id": self._next_id(),
                 "source": source_id,
                 "target": target_id,
                 "type": "causal",
                 "relationship": relationship,
                 "confidence": confidence
             }
-            self.graph["edges"][edge["id"]] = edge
+            edges = self.graph["edges"]
+            # Typed column first: if it rejects the value, no column has changed
+            edges["confidence"].append(confidence)
+            for key in ("id", "source", "target", "type", "relationship"):
+                edges[key].append(edge[key])
             return edge
     
+    def add_causal_relationships(self, relationships: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add many causal edges to graph at once
+        
+        Args:
+            relationships: Dicts with the add_causal_relationship arguments
+                    (source, target, relationship, evidence, confidence)
+        
+        Returns:
+            Edge information per relationship, in input order
+        """
+        if not self.use_rust:
+            return [self.add_causal_relationship(**rel) for rel in relationships]
+        
+        records = []
+        for rel in relationships:
+            source, target = rel["source"], rel["target"]
+            records.append((
+                self._get_or_create_node(source),
+                self._get_or_create_node(target),
+                rel["relationship"],
+                self._infer_domain(source),
+                self._infer_domain(target),
+                rel["evidence"],
+                rel["confidence"]
+            ))
+        
+        edges = self.graph.add_causal_edges_bulk(records)
+        return [
+            {
+                "id": edge.id,
+                "type": "causal",
+                "relationship": edge.label,
+                "confidence": edge.confidence
+            }
+            for edge in edges
+        ]
+    
     def _get_or_create_node(self, description: str) -> str:
         """Get existing node or create new one"""
         # Simple implementation: create new node
-        return str(uuid.uuid4())
+        return self._next_id()
     
     def _infer_domain(self, text: str) -> str:
         """Infer research domain from text"""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ["spike", "protein", "viral", "virus"]):
-            return "Virology"
-        elif any(word in text_lower for word in ["antibody", "immune", "t-cell"]):
-            return "Immunology"
-        elif any(word in text_lower for word in ["variant", "mutation", "omicron", "delta"]):
-            return "Genomics"
-        elif any(word in text_lower for word in ["treatment", "drug", "therapy", "paxlovid"]):
-            return "Treatment"
-        elif any(word in text_lower for word in ["policy", "mask", "mandate", "public health"]):
-            return "PublicHealth"
-        else:
-            return "Virology"
+        return _infer_domain_cached(text)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get graph statistics"""
         if self.use_rust:
             return self.graph.get_statistics()
         else:
+            confidences = self.graph["edges"]["confidence"]
             return {
                 "total_nodes": len(self.graph["nodes"]),
-                "total_edges": len(self.graph["edges"]),
-                "serendipity_traces": len(self.graph["traces"])
+                "total_edges": len(confidences),
+                "serendipity_traces": len(self.graph["traces"]),
+                "mean_confidence": (
+                    _f32_to_float(sum(confidences) / len(confidences)) if confidences else 0.0
+                )
             }
     
     def export_graph(self, filepath: str):
-        """Export graph to JSON file"""
+        """Export graph to JSON file (fallback graph is encoded with orjson when installed)"""
         if self.use_rust:
             self.graph.export_json(filepath)
+            return
+        
+        graph = {
+            **self.graph,
+            "edges": self._fallback_edges(),
+            "traces": [
+                {"id": t.id, "session_id": t.session_id, "question": t.question, "steps": t.steps}
+                for t in self.graph["traces"]
+            ]
+        }
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(graph, option=orjson.OPT_INDENT_2))
         else:
-            with open(filepath, 'w') as f:
-                json.dump(self.graph, f, indent=2)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(graph, f, indent=2, ensure_ascii=False)
 
 
 def demo_integration():
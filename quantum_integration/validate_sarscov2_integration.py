@@ -5,15 +5,71 @@ Validation script for SARS-CoV-2 Multi-Intent Knowledge Graph Integration
 """
 
 import os
+import re
 import sys
 import json
+import mmap
+from functools import wraps
 from pathlib import Path
 
+
+class _Reporter:
+    """Buffers report lines and writes them to stdout in one call"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def __call__(self, text=""):
+        self.lines.append(f"{text}\n")
+    
+    def flush(self):
+        sys.stdout.writelines(self.lines)
+        sys.stdout.flush()
+        self.lines.clear()
+
+
+_report = _Reporter()
+
+
+def _flushes_report(func):
+    """Flush the report buffer when func returns, so direct calls print too"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _report.flush()
+    return wrapper
+
+
+def _list_dir(directory):
+    """Names of the entries in directory (empty if it cannot be listed)"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+def _find_sections(file_path, sections):
+    """Case-insensitively check which sections occur in a file, via mmap"""
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return [False] * len(sections)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [
+                re.search(re.escape(section.encode('utf-8')), mm, re.IGNORECASE) is not None
+                for section in sections
+            ]
+
+
+@_flushes_report
 def validate_file_structure():
     """Validate all required files exist"""
-    print("=" * 60)
-    print("VALIDATING FILE STRUCTURE")
-    print("=" * 60)
+    _report("=" * 60)
+    _report("VALIDATING FILE STRUCTURE")
+    _report("=" * 60)
     
     base_path = Path(__file__).parent
     rust_path = base_path / "quantum-limit-graph-v2.4.0/rust/egg/crates/limit-sarscov2"
@@ -52,24 +108,31 @@ def validate_file_structure():
         ]
     }
     
+    # List each parent directory once instead of stat-ing every file
+    listings = {}
+    
     all_valid = True
     for category, files in required_files.items():
-        print(f"\n{category}:")
+        _report(f"\n{category}:")
         for file_path in files:
-            exists = file_path.exists()
+            parent = file_path.parent
+            if parent not in listings:
+                listings[parent] = _list_dir(parent)
+            exists = file_path.name in listings[parent]
             status = "✓" if exists else "✗"
-            print(f"  {status} {file_path.name}")
+            _report(f"  {status} {file_path.name}")
             if not exists:
                 all_valid = False
     
     return all_valid
 
 
+@_flushes_report
 def validate_rust_code():
     """Validate Rust code structure"""
-    print("\n" + "=" * 60)
-    print("VALIDATING RUST CODE")
-    print("=" * 60)
+    _report("\n" + "=" * 60)
+    _report("VALIDATING RUST CODE")
+    _report("=" * 60)
     
     base_path = Path(__file__).parent
     rust_path = base_path / "quantum-limit-graph-v2.4.0/rust/egg/crates/limit-sarscov2"
@@ -87,11 +150,11 @@ def validate_rust_code():
             "pub use serendipity_trace::",
         ]
         
-        print("\nlib.rs exports:")
+        _report("\nlib.rs exports:")
         for export in required_exports:
             exists = export in content
             status = "✓" if exists else "✗"
-            print(f"  {status} {export}")
+            _report(f"  {status} {export}")
     
     # Check Cargo.toml dependencies
     cargo_toml = rust_path / "Cargo.toml"
@@ -99,30 +162,34 @@ def validate_rust_code():
         content = cargo_toml.read_text()
         required_deps = ["chrono", "serde", "uuid", "axum", "tokio"]
         
-        print("\nCargo.toml dependencies:")
+        _report("\nCargo.toml dependencies:")
         for dep in required_deps:
             exists = dep in content
             status = "✓" if exists else "✗"
-            print(f"  {status} {dep}")
+            _report(f"  {status} {dep}")
 
 
+@_flushes_report
 def validate_python_integration():
     """Validate Python integration"""
-    print("\n" + "=" * 60)
-    print("VALIDATING PYTHON INTEGRATION")
-    print("=" * 60)
+    _report("\n" + "=" * 60)
+    _report("VALIDATING PYTHON INTEGRATION")
+    _report("=" * 60)
+    
+    # The integration module may print on import; keep the output in order
+    _report.flush()
     
     try:
         from sarscov2_graph_integration import SARSCoV2ResearchAgent
-        print("\n✓ Successfully imported SARSCoV2ResearchAgent")
+        _report("\n✓ Successfully imported SARSCoV2ResearchAgent")
         
         # Test initialization
         agent = SARSCoV2ResearchAgent(use_rust=False)
-        print("✓ Successfully initialized agent")
+        _report("✓ Successfully initialized agent")
         
         # Test basic functionality
         results = agent.query_multi_intent("Test question about COVID-19")
-        print(f"✓ Multi-intent query works (found {len(results['intents'])} intents)")
+        _report(f"✓ Multi-intent query works (found {len(results['intents'])} intents)")
         
         # Test hypothesis exploration
         hyp = agent.explore_hypothesis(
@@ -130,28 +197,29 @@ def validate_python_integration():
             "Test hypothesis",
             ["Genomics", "Virology"]
         )
-        print(f"✓ Hypothesis exploration works (confidence: {hyp['confidence']:.2f})")
+        _report(f"✓ Hypothesis exploration works (confidence: {hyp['confidence']:.2f})")
         
         # Test R-D curve
         rd = agent.compute_rd_curve("test_intent", [5, 10, 15])
-        print(f"✓ R-D curve computation works (knee at rate: {rd['knee_point']['rate']})")
+        _report(f"✓ R-D curve computation works (knee at rate: {rd['knee_point']['rate']})")
         
         # Test statistics
         stats = agent.get_statistics()
-        print(f"✓ Statistics computation works ({stats['total_edges']} edges)")
+        _report(f"✓ Statistics computation works ({stats['total_edges']} edges)")
         
         return True
         
     except Exception as e:
-        print(f"\n✗ Error: {e}")
+        _report(f"\n✗ Error: {e}")
         return False
 
 
+@_flushes_report
 def validate_documentation():
     """Validate documentation completeness"""
-    print("\n" + "=" * 60)
-    print("VALIDATING DOCUMENTATION")
-    print("=" * 60)
+    _report("\n" + "=" * 60)
+    _report("VALIDATING DOCUMENTATION")
+    _report("=" * 60)
     
     base_path = Path(__file__).parent
     
@@ -171,32 +239,32 @@ def validate_documentation():
     
     all_valid = True
     for doc_name, doc_path in docs.items():
-        print(f"\n{doc_name}:")
+        _report(f"\n{doc_name}:")
         if doc_path.exists():
             try:
-                content = doc_path.read_text(encoding='utf-8')
                 sections = required_sections.get(doc_name, [])
-                for section in sections:
-                    exists = section.lower() in content.lower()
+                found = _find_sections(doc_path, sections)
+                for section, exists in zip(sections, found):
                     status = "✓" if exists else "✗"
-                    print(f"  {status} Contains '{section}' section")
+                    _report(f"  {status} Contains '{section}' section")
                     if not exists:
                         all_valid = False
             except Exception as e:
-                print(f"  ✗ Error reading file: {e}")
+                _report(f"  ✗ Error reading file: {e}")
                 all_valid = False
         else:
-            print(f"  ✗ File not found")
+            _report(f"  ✗ File not found")
             all_valid = False
     
     return all_valid
 
 
+@_flushes_report
 def generate_report():
     """Generate validation report"""
-    print("\n" + "=" * 60)
-    print("VALIDATION REPORT")
-    print("=" * 60)
+    _report("\n" + "=" * 60)
+    _report("VALIDATION REPORT")
+    _report("=" * 60)
     
     results = {
         "File Structure": validate_file_structure(),
@@ -205,37 +273,37 @@ def generate_report():
         "Documentation": validate_documentation(),
     }
     
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
+    _report("\n" + "=" * 60)
+    _report("SUMMARY")
+    _report("=" * 60)
     
     for category, passed in results.items():
         status = "✓ PASS" if passed else "✗ FAIL"
-        print(f"{status} - {category}")
+        _report(f"{status} - {category}")
     
     all_passed = all(results.values())
     
-    print("\n" + "=" * 60)
+    _report("\n" + "=" * 60)
     if all_passed:
-        print("✓ ALL VALIDATIONS PASSED")
-        print("SARS-CoV-2 Multi-Intent Graph is ready for integration!")
+        _report("✓ ALL VALIDATIONS PASSED")
+        _report("SARS-CoV-2 Multi-Intent Graph is ready for integration!")
     else:
-        print("✗ SOME VALIDATIONS FAILED")
-        print("Please review the errors above.")
-    print("=" * 60)
+        _report("✗ SOME VALIDATIONS FAILED")
+        _report("Please review the errors above.")
+    _report("=" * 60)
     
     return all_passed
 
 
 def main():
     """Main validation function"""
-    print("\n")
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 58 + "║")
-    print("║" + "  SARS-CoV-2 Multi-Intent Graph Validation".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╚" + "=" * 58 + "╝")
-    print("\n")
+    _report("\n")
+    _report("╔" + "=" * 58 + "╗")
+    _report("║" + " " * 58 + "║")
+    _report("║" + "  SARS-CoV-2 Multi-Intent Graph Validation".center(58) + "║")
+    _report("║" + " " * 58 + "║")
+    _report("╚" + "=" * 58 + "╝")
+    _report("\n")
     
     success = generate_report()
     
@@ -255,7 +323,8 @@ def main():
     with open(results_file, 'w') as f:
         json.dump(results, f, indent=2)
     
-    print(f"\n✓ Validation results saved to {results_file}")
+    _report(f"\n✓ Validation results saved to {results_file}")
+    _report.flush()
     
     return 0 if success else 1
 